@@ -1,14 +1,60 @@
 #!/usr/bin/env python3
+import base64
+import contextlib
+import copy
+import functools
+import hashlib
+import hmac
+import http.client
+import io
 import json
+import logging
+import logging.handlers
 import os
+import queue
+import random
+import re
+import selectors
+import signal
+import socket
+import ssl
+import sys
+import threading
+import time
 import urllib.error
+import urllib.parse
 import urllib.request
-from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from collections import OrderedDict, deque
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, as_completed, wait
+from http.server import BaseHTTPRequestHandler, HTTPServer
+
+try:
+    import orjson
+except ImportError:  # optional speedup; stdlib json is used when orjson is not installed
+    orjson = None
+try:
+    import blake3
+except ImportError:  # optional speedup; hashlib.blake2b keys the result cache when blake3 is not installed
+    blake3 = None
 
 HOST = os.getenv("BACKEND_HOST", "127.0.0.1")
 PORT = int(os.getenv("BACKEND_PORT", "8080"))
 REQUIRE_AUTH = os.getenv("API_REQUIRE_AUTH", "true").lower() == "true"
 AUTH_TOKEN = os.getenv("API_AUTH_TOKEN", "dev-token")
+AUTH_TOKEN_BYTES = AUTH_TOKEN.encode("utf-8")
+_BEARER = "Bearer "
+_BEARER_LEN = len(_BEARER)
+# Requests are served on a bounded thread pool; extra connections queue instead of spawning threads.
+BACKEND_MAX_WORKERS = max(1, int(os.getenv("BACKEND_MAX_WORKERS", "32")))
+# Worker processes bound to the same port with SO_REUSEPORT; the kernel spreads connections across them.
+# Each process has its own thread pool, caches and provider concurrency limit.
+BACKEND_PROCESSES = max(1, int(os.getenv("BACKEND_PROCESSES", "1")))
+# Idle HTTP/1.1 keep-alive connections wait in a selector (not on a worker) and are closed after this.
+BACKEND_KEEPALIVE_SECONDS = max(1, int(os.getenv("BACKEND_KEEPALIVE_SECONDS", "75")))
+# Once a request has started arriving, a worker gives up on a client that sends nothing for this long.
+BACKEND_REQUEST_TIMEOUT_SECONDS = max(1, int(os.getenv("BACKEND_REQUEST_TIMEOUT_SECONDS", "30")))
+# Larger uploads are rejected from Content-Length alone, before any of the body is read.
+BACKEND_MAX_BODY_BYTES = max(1, int(os.getenv("BACKEND_MAX_BODY_BYTES", str(64 * 1024 * 1024))))
 OPENROUTER_API_KEY = os.getenv("OPENROUTER_API_KEY", "").strip()
 OPENROUTER_URL = os.getenv("OPENROUTER_URL", "https://openrouter.ai/api/v1/chat/completions")
 OPENROUTER_PRIMARY_MODEL = os.getenv("OPENROUTER_PRIMARY_MODEL", "nvidia/nemotron-nano-12b-v2-vl:free")
@@ -20,9 +66,38 @@ OPENROUTER_APP_NAME = os.getenv("OPENROUTER_APP_NAME", "LabLens")
 OPENROUTER_APP_URL = os.getenv("OPENROUTER_APP_URL", "https://example.com")
 OPENROUTER_MAX_TOKENS = int(os.getenv("OPENROUTER_MAX_TOKENS", "2400"))
 OPENROUTER_TIMEOUT_SECONDS = int(os.getenv("OPENROUTER_TIMEOUT_SECONDS", "180"))
+# Number of recent images whose data-URL/JSON encoding is kept (each entry holds the base64 string twice).
+OPENROUTER_IMAGE_CACHE_SIZE = max(1, int(os.getenv("OPENROUTER_IMAGE_CACHE_SIZE", "32")))
+# Request SSE streaming so responses are parsed as they arrive and hedged losers can stop reading early.
+OPENROUTER_STREAM_RESPONSES = os.getenv("OPENROUTER_STREAM_RESPONSES", "false").lower() == "true"
 OPENROUTER_PAGE_BATCH_SIZE = max(1, int(os.getenv("OPENROUTER_PAGE_BATCH_SIZE", "2")))
 OPENROUTER_MIN_BIOMARKERS_PER_IMAGE_HINT = max(1, int(os.getenv("OPENROUTER_MIN_BIOMARKERS_PER_IMAGE_HINT", "2")))
 OPENROUTER_ENABLE_RECONCILIATION = os.getenv("OPENROUTER_ENABLE_RECONCILIATION", "true").lower() == "true"
+# Skip the reconciliation pass when single-page retries produced a result that passes _is_complete (as the first pass must).
+OPENROUTER_SKIP_RECONCILE_IF_COMPLETE = os.getenv("OPENROUTER_SKIP_RECONCILE_IF_COMPLETE", "true").lower() == "true"
+# Always reconcile a first-pass result, even when it needed no retries and already looks complete.
+OPENROUTER_FORCE_RECONCILIATION = os.getenv("OPENROUTER_FORCE_RECONCILIATION", "false").lower() == "true"
+# Upper bound on in-flight provider calls across all threads (keeps parallel retries under rate limits).
+OPENROUTER_MAX_CONCURRENCY = max(1, int(os.getenv("OPENROUTER_MAX_CONCURRENCY", "8")))
+# Page batches run on a shared pool (across requests); more workers than upstream slots would only queue.
+OPENROUTER_BATCH_WORKERS = max(1, int(os.getenv("OPENROUTER_BATCH_WORKERS", str(OPENROUTER_MAX_CONCURRENCY))))
+# How long a call waits for a free upstream slot before the whole request fails with a retryable 503.
+# Defaults to one provider timeout, the longest a healthy slot can stay taken.
+OPENROUTER_QUEUE_TIMEOUT_SECONDS = max(1, int(os.getenv("OPENROUTER_QUEUE_TIMEOUT_SECONDS", str(OPENROUTER_TIMEOUT_SECONDS))))
+# Per-model circuit breaker: skip a model for the cooldown after this many consecutive provider failures.
+OPENROUTER_BREAKER_FAILURE_THRESHOLD = max(1, int(os.getenv("OPENROUTER_BREAKER_FAILURE_THRESHOLD", "3")))
+OPENROUTER_BREAKER_COOLDOWN_SECONDS = max(1, int(os.getenv("OPENROUTER_BREAKER_COOLDOWN_SECONDS", "30")))
+# After a 429/5xx/transport failure the next fallback waits base * 2**n (capped, +-50% jitter) before calling.
+OPENROUTER_BACKOFF_BASE_SECONDS = max(0, int(os.getenv("OPENROUTER_BACKOFF_BASE_MS", "100"))) / 1000
+OPENROUTER_BACKOFF_CAP_SECONDS = max(0, int(os.getenv("OPENROUTER_BACKOFF_CAP_MS", "2000"))) / 1000
+# Opt-in hedging: start the next fallback model if the current attempt has not answered within this delay.
+# Set it well above the primary model's typical latency; 0 (the default) disables hedging.
+OPENROUTER_HEDGE_DELAY_SECONDS = int(os.getenv("OPENROUTER_HEDGE_DELAY_MS", "0")) / 1000
+# Reconciliation/synthesis results reused for identical provider requests (size 0 disables the cache).
+OPENROUTER_RESULT_CACHE_SIZE = max(0, int(os.getenv("OPENROUTER_RESULT_CACHE_SIZE", "256")))
+OPENROUTER_RESULT_CACHE_TTL_SECONDS = max(1, int(os.getenv("OPENROUTER_RESULT_CACHE_TTL_SECONDS", "600")))
+# Also serve single-page extraction reads from that cache, so a re-submitted report reuses them (stale within the TTL).
+OPENROUTER_CACHE_PAGE_RESULTS = os.getenv("OPENROUTER_CACHE_PAGE_RESULTS", "false").lower() == "true"
 AI_OCR_ONLY_MODE = os.getenv("AI_OCR_ONLY_MODE", "false").lower() == "true"
 AI_VISUAL_ONLY_MODE = os.getenv("AI_VISUAL_ONLY_MODE", "false").lower() == "true"
 
@@ -38,7 +113,459 @@ QWEN_FALLBACK_MODEL_2 = os.getenv("QWEN_FALLBACK_MODEL_2", "qwen2.5-vl-72b-instr
 QWEN_FALLBACK_MODEL_3 = os.getenv("QWEN_FALLBACK_MODEL_3", "").strip()
 
 
+def _json_dumps(obj) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(obj)
+    return json.dumps(obj, ensure_ascii=False).encode("utf-8")
+
+
+def _json_loads(raw: bytes | str):
+    if orjson is not None:
+        return orjson.loads(raw)
+    return json.loads(raw)
+
+
+logger = logging.getLogger("mock_backend")
+_BATCH_MSG = "analyzing page batch %s of total_pages=%d"
+
+
+def _start_logging() -> logging.handlers.QueueListener:
+    # Request threads only enqueue records; formatting and the stdout write happen on the listener thread.
+    log_queue: queue.Queue = queue.Queue(-1)
+    stream_handler = logging.StreamHandler(sys.stdout)
+    stream_handler.setFormatter(logging.Formatter("mock-backend: %(message)s"))
+    listener = logging.handlers.QueueListener(log_queue, stream_handler)
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.setLevel(logging.INFO)
+    logger.propagate = False
+    listener.start()
+    return listener
+
+
+_PROVIDER_SEMAPHORE = threading.BoundedSemaphore(OPENROUTER_MAX_CONCURRENCY)
+
+
+class _ProviderBusyError(RuntimeError):
+    """No upstream slot freed up in time. Says nothing about the model, so it fails the request instead of the chain."""
+
+
+class _CircuitBreaker:
+    """Closed -> open after consecutive provider failures; after the cooldown one trial call decides."""
+
+    def __init__(self, failure_threshold: int, cooldown_seconds: float) -> None:
+        self._failure_threshold = failure_threshold
+        self._cooldown_seconds = cooldown_seconds
+        self._failures = 0
+        self._opened_at: float | None = None
+        self._trial_in_flight = False
+        self._lock = threading.Lock()
+
+    def allow(self) -> bool:
+        with self._lock:
+            if self._opened_at is None:
+                return True
+            if self._trial_in_flight or time.monotonic() - self._opened_at < self._cooldown_seconds:
+                return False
+            self._trial_in_flight = True
+            return True
+
+    def record(self, *, succeeded: bool) -> None:
+        with self._lock:
+            self._trial_in_flight = False
+            if succeeded:
+                self._failures = 0
+                self._opened_at = None
+                return
+            self._failures += 1
+            if self._opened_at is not None or self._failures >= self._failure_threshold:
+                self._opened_at = time.monotonic()
+
+    def abandon(self) -> None:
+        # A cancelled call says nothing about provider health; just free the half-open trial slot.
+        with self._lock:
+            self._trial_in_flight = False
+
+    def state(self) -> str:
+        with self._lock:
+            if self._opened_at is None:
+                return "closed"
+            if self._trial_in_flight or time.monotonic() - self._opened_at >= self._cooldown_seconds:
+                return "half_open"
+            return "open"
+
+
+_CIRCUIT_BREAKERS: dict[str, _CircuitBreaker] = {}
+
+
+class _CancelEvent(threading.Event):
+    """threading.Event whose set() also runs registered abort callbacks (closing in-flight provider sockets)."""
+
+    def __init__(self) -> None:
+        super().__init__()
+        self._callbacks: set = set()
+        self._callbacks_lock = threading.Lock()
+
+    def add_callback(self, callback) -> None:
+        with self._callbacks_lock:
+            if not self.is_set():
+                self._callbacks.add(callback)
+                return
+        callback()
+
+    def remove_callback(self, callback) -> None:
+        with self._callbacks_lock:
+            self._callbacks.discard(callback)
+
+    def set(self) -> None:
+        with self._callbacks_lock:
+            super().set()
+            callbacks, self._callbacks = self._callbacks, set()
+        for callback in callbacks:
+            callback()
+
+
+def _circuit_breaker(model: str) -> _CircuitBreaker:
+    breaker = _CIRCUIT_BREAKERS.get(model)
+    if breaker is None:
+        breaker = _CIRCUIT_BREAKERS.setdefault(
+            model,
+            _CircuitBreaker(OPENROUTER_BREAKER_FAILURE_THRESHOLD, OPENROUTER_BREAKER_COOLDOWN_SECONDS),
+        )
+    return breaker
+
+
+def _circuit_breaker_states() -> dict[str, str]:
+    # Only non-closed breakers are interesting to report.
+    states = {model: breaker.state() for model, breaker in list(_CIRCUIT_BREAKERS.items())}
+    return {model: state for model, state in states.items() if state != "closed"}
+
+
+def _is_provider_outage(error: Exception) -> bool:
+    # Rate limits, 5xx and transport errors say the provider is unhealthy; 4xx and bad model output do not.
+    if isinstance(error, urllib.error.HTTPError):
+        return error.code == 429 or error.code >= 500
+    return isinstance(error, (OSError, http.client.HTTPException))
+
+
+def _backoff_delay(outages: int) -> float:
+    # Full jitter around the capped exponential keeps parallel retries from hitting the provider in lockstep.
+    return min(OPENROUTER_BACKOFF_CAP_SECONDS, OPENROUTER_BACKOFF_BASE_SECONDS * 2 ** (outages - 1)) * random.uniform(0.5, 1.5)
+
+
+_BATCH_EXECUTOR = ThreadPoolExecutor(max_workers=OPENROUTER_BATCH_WORKERS, thread_name_prefix="mock-backend-batch")
+
+
+class _ResultCache:
+    """Bounded LRU with a TTL; concurrent callers of the same missing key share one computation."""
+
+    def __init__(self, maxsize: int, ttl_seconds: float) -> None:
+        self._maxsize = maxsize
+        self._ttl_seconds = ttl_seconds
+        self._entries: OrderedDict[bytes, tuple[float, object]] = OrderedDict()
+        self._in_flight: dict[bytes, Future] = {}
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key: bytes, compute, *, cacheable):
+        if self._maxsize <= 0:
+            return compute()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and time.monotonic() - entry[0] < self._ttl_seconds:
+                self._entries.move_to_end(key)
+                return copy.deepcopy(entry[1])
+            if entry is not None:
+                del self._entries[key]
+            future = self._in_flight.get(key)
+            owner = future is None
+            if owner:
+                future = self._in_flight[key] = Future()
+        if not owner:
+            return copy.deepcopy(future.result())
+        try:
+            value = compute()
+        except BaseException as e:
+            with self._lock:
+                del self._in_flight[key]
+            future.set_exception(e)
+            raise
+        with self._lock:
+            del self._in_flight[key]
+            if cacheable(value):
+                self._entries[key] = (time.monotonic(), copy.deepcopy(value))
+                while len(self._entries) > self._maxsize:
+                    self._entries.popitem(last=False)
+        future.set_result(value)
+        return copy.deepcopy(value)
+
+
+_RESULT_CACHE = _ResultCache(OPENROUTER_RESULT_CACHE_SIZE, OPENROUTER_RESULT_CACHE_TTL_SECONDS)
+
+
+def _request_fingerprint(stage: str, request_template: bytes) -> bytes:
+    # The template holds the prompt (normalized JSON, OCR text, page context) and every image, so it is the exact key.
+    # Entries are shared across clients, so the hash must stay collision-resistant (no xxhash-style shortcuts).
+    if blake3 is not None:
+        digest = blake3.blake3(request_template)
+        digest.update(stage.encode("utf-8"))
+        return digest.digest(length=16)
+    digest = hashlib.blake2b(request_template, digest_size=16)
+    digest.update(stage.encode("utf-8"))
+    return digest.digest()
+
+
+class _ConnectionPool:
+    """Keeps idle keep-alive connections per host so repeated provider calls skip TCP/TLS setup.
+
+    HTTP_PROXY/HTTPS_PROXY/NO_PROXY are honoured like urlopen: https targets are tunnelled with CONNECT,
+    plain http requests are sent to the proxy in absolute form.
+    """
+
+    def __init__(self, maxsize: int, timeout: float) -> None:
+        self._maxsize = maxsize
+        self._timeout = timeout
+        self._ssl_context = ssl.create_default_context()
+        self._idle: dict[tuple[str, str], list[http.client.HTTPConnection]] = {}
+        self._in_use: set[http.client.HTTPConnection] = set()
+        self._closed = False
+        self._proxies: dict[tuple[str, str], tuple[str, dict[str, str]] | None] = {}
+        self._lock = threading.Lock()
+
+    def _proxy(self, key: tuple[str, str]) -> tuple[str, dict[str, str]] | None:
+        """Return (proxy netloc, proxy headers) for the target, or None for a direct connection."""
+        if key in self._proxies:
+            return self._proxies[key]
+        scheme, netloc = key
+        found = None
+        proxy_url = urllib.request.getproxies().get(scheme)
+        host = urllib.parse.urlsplit(f"//{netloc}").hostname or netloc
+        if proxy_url and not urllib.request.proxy_bypass(host):
+            proxy = urllib.parse.urlsplit(proxy_url if "://" in proxy_url else f"http://{proxy_url}")
+            proxy_headers = {}
+            if proxy.username is not None:
+                credentials = f"{urllib.parse.unquote(proxy.username)}:{urllib.parse.unquote(proxy.password or '')}"
+                proxy_headers["Proxy-Authorization"] = "Basic " + base64.b64encode(credentials.encode("utf-8")).decode("ascii")
+            found = (proxy.netloc.rpartition("@")[2], proxy_headers)
+        self._proxies[key] = found
+        return found
+
+    def _acquire(self, key: tuple[str, str]) -> tuple[http.client.HTTPConnection, bool]:
+        with self._lock:
+            if self._closed:
+                raise ConnectionAbortedError("connection pool closed (server shutting down)")
+            idle = self._idle.get(key)
+            if idle:
+                return idle.pop(), True
+        scheme, netloc = key
+        proxy = self._proxy(key)
+        if scheme == "https":
+            if proxy is None:
+                return http.client.HTTPSConnection(netloc, timeout=self._timeout, context=self._ssl_context), False
+            proxy_netloc, proxy_headers = proxy
+            conn = http.client.HTTPSConnection(proxy_netloc, timeout=self._timeout, context=self._ssl_context)
+            conn.set_tunnel(netloc, headers=proxy_headers)
+            return conn, False
+        return http.client.HTTPConnection(proxy[0] if proxy else netloc, timeout=self._timeout), False
+
+    def _release(self, key: tuple[str, str], conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            idle = self._idle.setdefault(key, [])
+            if not self._closed and len(idle) < self._maxsize:
+                idle.append(conn)
+                return
+        conn.close()
+
+    @contextlib.contextmanager
+    def open(
+        self,
+        method: str,
+        url: str,
+        body: bytes | None,
+        headers: dict[str, str],
+        *,
+        cancel_event: _CancelEvent | None = None,
+    ):
+        """Yield the response for incremental reads; non-2xx responses raise urllib.error.HTTPError like urlopen.
+
+        The connection goes back to the pool only if the body was read to the end. Setting
+        `cancel_event` shuts the socket down, so a blocked send/read fails at once.
+        """
+        parts = urllib.parse.urlsplit(url)
+        key = (parts.scheme, parts.netloc)
+        path = (parts.path or "/") + (f"?{parts.query}" if parts.query else "")
+        proxy = self._proxy(key) if parts.scheme == "http" else None
+        if proxy is not None:
+            # A forward proxy needs the absolute URL (http.client derives Host from it) plus its own auth header.
+            path = urllib.parse.urlunsplit((parts.scheme, parts.netloc, path, "", ""))
+            headers = {**headers, **proxy[1]}
+        active: list[http.client.HTTPConnection] = []
+
+        def abort() -> None:
+            sock = active[-1].sock if active else None
+            if sock is not None:
+                with contextlib.suppress(OSError):
+                    sock.shutdown(socket.SHUT_RDWR)
+
+        if cancel_event is not None:
+            cancel_event.add_callback(abort)
+        try:
+            while True:
+                conn, reused = self._acquire(key)
+                active.append(conn)
+                with self._lock:
+                    self._in_use.add(conn)
+                try:
+                    conn.request(method, path, body=body, headers=headers)
+                    if cancel_event is not None and cancel_event.is_set():
+                        # Cancelled while connecting, before abort() could see the socket.
+                        raise ConnectionAbortedError("request cancelled")
+                    resp = conn.getresponse()
+                except ConnectionError:
+                    conn.close()
+                    # An idle connection may have been dropped by the server; retry once on a fresh one.
+                    if reused and not (cancel_event is not None and cancel_event.is_set()):
+                        continue
+                    raise
+                except Exception:
+                    conn.close()
+                    raise
+                break
+            if not 200 <= resp.status < 300:
+                try:
+                    raw = resp.read()
+                finally:
+                    self._finish(key, conn, resp)
+                raise urllib.error.HTTPError(url, resp.status, resp.reason, resp.headers, io.BytesIO(raw))
+            try:
+                yield resp
+            except BaseException:
+                conn.close()
+                raise
+            self._finish(key, conn, resp)
+        finally:
+            if cancel_event is not None:
+                cancel_event.remove_callback(abort)
+            with self._lock:
+                self._in_use.difference_update(active)
+
+    def _finish(self, key: tuple[str, str], conn: http.client.HTTPConnection, resp: http.client.HTTPResponse) -> None:
+        if resp.isclosed() and not resp.will_close:
+            self._release(key, conn)
+        else:
+            conn.close()
+
+    def request(
+        self,
+        method: str,
+        url: str,
+        body: bytes | None,
+        headers: dict[str, str],
+        *,
+        cancel_event: _CancelEvent | None = None,
+    ) -> bytes:
+        with self.open(method, url, body, headers, cancel_event=cancel_event) as resp:
+            return resp.read()
+
+    def warm(self, url: str) -> None:
+        """Open a connection to the URL's host ahead of the first real request."""
+        parts = urllib.parse.urlsplit(url)
+        try:
+            self.request("HEAD", f"{parts.scheme}://{parts.netloc}/", None, {})
+        except urllib.error.HTTPError:
+            pass  # Any status is fine; the connection itself is what gets pooled.
+
+    def close(self) -> None:
+        """Close idle connections and abort in-flight calls, so provider threads cannot hold up exit."""
+        with self._lock:
+            self._closed = True
+            idle, self._idle = self._idle, {}
+            in_use = list(self._in_use)
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+        for conn in in_use:
+            if conn.sock is not None:
+                with contextlib.suppress(OSError):
+                    conn.sock.shutdown(socket.SHUT_RDWR)
+
+
+_HTTP_POOL = _ConnectionPool(maxsize=16, timeout=OPENROUTER_TIMEOUT_SECONDS)
+
+
+# Derived values live under this non-string key, which no client JSON document can contain or pre-fill.
+_DERIVED_STATE_KEY = object()
+
+
+def _derived_state(payload: dict) -> dict:
+    return payload.setdefault(_DERIVED_STATE_KEY, {})
+
+
+def _payload_cached(payload: dict, cache_key: str, compute):
+    # The payload is parsed by every batch, retry and fallback call; keep derived values next to it.
+    state = _derived_state(payload)
+    cached = state.get(cache_key)
+    if cached is None:
+        cached = compute(payload)
+        state[cache_key] = cached
+    return cached
+
+
+def _payload_memoized(payload: dict, cache_key: str, args: list[int], compute):
+    memo = _derived_state(payload).setdefault(cache_key, {})
+    key = tuple(args)
+    if key not in memo:
+        memo[key] = compute(payload, list(key))
+    return memo[key]
+
+
+def _parse_request_payload(payload) -> dict:
+    """Validate the inbound JSON once, at the API edge, and return the request dict the pipeline reads.
+
+    Raises ValueError for a non-object body or a missing/empty images array. Client keys starting
+    with "_" are dropped. Interior helpers read the cached, already-typed values built here.
+    """
+    if not isinstance(payload, dict):
+        raise ValueError("Request JSON must be an object")
+    images = payload.get("images")
+    if not isinstance(images, list) or not images:
+        raise ValueError("images must be a non-empty array")
+    request = {key: value for key, value in payload.items() if not key.startswith("_")}
+    _extract_images(request)
+    _extract_report_text(request)
+    _report_text_page_index(request)
+    _extract_stitched_page_groups(request)
+    _profile_context_json(request)
+    return request
+
+
+def _extract_images(payload: dict) -> list[str]:
+    return _payload_cached(payload, "_images", _parse_images)
+
+
 def _extract_report_text(payload: dict) -> str:
+    return _payload_cached(payload, "_report_text", _parse_report_text)
+
+
+def _extract_report_text_by_page(payload: dict) -> list[dict]:
+    return _payload_cached(payload, "_report_text_by_page", _parse_report_text_by_page)
+
+
+def _extract_stitched_page_groups(payload: dict) -> list[list[int]]:
+    return _payload_cached(payload, "_stitched_page_groups", _parse_stitched_page_groups)
+
+
+def _report_text_page_index(payload: dict) -> dict[int, str]:
+    return _payload_cached(payload, "_report_text_page_index", _build_report_text_page_index)
+
+
+def _parse_images(payload: dict) -> list[str]:
+    images = payload.get("images", [])
+    if not isinstance(images, list):
+        return []
+    # Keep positions (page numbering follows the upload order); unusable entries become "".
+    return [encoded.strip() if isinstance(encoded, str) else "" for encoded in images]
+
+
+def _parse_report_text(payload: dict) -> str:
     for key in ("reportText", "report_text", "ocrText", "ocr_text"):
         value = payload.get(key)
         if isinstance(value, str) and value.strip():
@@ -46,7 +573,7 @@ def _extract_report_text(payload: dict) -> str:
     return ""
 
 
-def _extract_report_text_by_page(payload: dict) -> list[dict]:
+def _parse_report_text_by_page(payload: dict) -> list[dict]:
     for key in ("reportTextByPage", "report_text_by_page", "ocrTextByPage", "ocr_text_by_page"):
         value = payload.get(key)
         if not isinstance(value, list):
@@ -69,7 +596,7 @@ def _extract_report_text_by_page(payload: dict) -> list[dict]:
     return []
 
 
-def _extract_stitched_page_groups(payload: dict) -> list[list[int]]:
+def _parse_stitched_page_groups(payload: dict) -> list[list[int]]:
     for key in ("stitchedPageGroups", "stitched_page_groups", "pageGroups", "page_groups"):
         value = payload.get(key)
         if not isinstance(value, list):
@@ -93,6 +620,15 @@ def _extract_stitched_page_groups(payload: dict) -> list[list[int]]:
     return []
 
 
+def _build_report_text_page_index(payload: dict) -> dict[int, str]:
+    index: dict[int, str] = {}
+    for item in _extract_report_text_by_page(payload):
+        part = f"[Page {item['page']}]\n{item['text']}"
+        page = item["page"]
+        index[page] = f"{index[page]}\n\n{part}" if page in index else part
+    return index
+
+
 def _mock_analysis_response() -> dict:
     return {
         "biomarkers": [
@@ -121,13 +657,55 @@ def _mock_analysis_response() -> dict:
     }
 
 
-def _openrouter_prompt(payload: dict, report_text: str, *, page_numbers: list[int] | None = None, total_pages: int | None = None) -> str:
+_PROMPT_RULES_PREFIX = (
+    "You are a medical lab report extraction assistant. Extract data exhaustively, not selectively. "
+    "Return ONLY valid JSON with this schema: "
+    "{\"biomarkers\":[{\"name\":\"string\",\"value\":\"string\",\"status\":\"Optimal|High|Low|Unknown\",\"explanation\":\"string\"}],"
+    "\"recommendations\":[{\"name\":\"string\",\"protocol\":\"string\",\"reason\":\"string\"}],"
+    "\"summary\":\"string\",\"disclaimer\":\"string\"}. "
+    "Do not include markdown fences.\n"
+    "Rules:\n"
+    "1) Extract ALL visible lab rows/test results, including normal values (do not return only abnormal values).\n"
+)
+_PROMPT_RULES_SUFFIX = (
+    "3) Preserve on-page reading order and page order.\n"
+    "4) If a test name appears on one page and its value/reference range continues on the next page, combine them into one biomarker entry.\n"
+    "5) If the same biomarker appears multiple times for different dates/panels, keep separate entries and mention date/panel/page in explanation.\n"
+    "6) If a row is partially unreadable but identifiable, include it with status=Unknown and explain what is missing.\n"
+    "7) Do not invent values, units, or ranges.\n"
+    "8) Do not emit duplicates caused by overlapping stitched page groups. Merge exact duplicates.\n"
+    "9) Keep explanations short and factual.\n"
+    "10) Summary must mention extraction coverage (e.g., full/partial) and any unreadable sections.\n\n"
+)
+_PROMPT_RULES_HYBRID = (
+    _PROMPT_RULES_PREFIX
+    + "2) OCR text is the PRIMARY source for names/values/units/ranges. Images are SECONDARY and should be used to validate layout and recover missed rows.\n"
+    + _PROMPT_RULES_SUFFIX
+)
+_PROMPT_RULES_VISUAL_ONLY = (
+    _PROMPT_RULES_PREFIX
+    + "2) OCR is disabled for this run. Use only the provided images and page ordering.\n"
+    + _PROMPT_RULES_SUFFIX
+)
+_PROMPT_RULES = _PROMPT_RULES_VISUAL_ONLY if AI_VISUAL_ONLY_MODE else _PROMPT_RULES_HYBRID
+
+
+def _profile_context_json(payload: dict) -> str:
+    # Same profile for every batch/retry of a report; serialize it once.
+    return _payload_cached(payload, "_profile_json", _serialize_profile_context)
+
+
+def _serialize_profile_context(payload: dict) -> str:
     profile = payload.get("profile") if isinstance(payload.get("profile"), dict) else {}
     safe_profile = {
         "gender": profile.get("gender"),
         "ageBand": profile.get("ageBand"),
         "weightBand": profile.get("weightBand"),
     }
+    return _json_dumps(safe_profile).decode("utf-8")
+
+
+def _openrouter_prompt(payload: dict, report_text: str, *, page_numbers: list[int] | None = None, total_pages: int | None = None) -> str:
     page_context = ""
     if page_numbers:
         page_context = (
@@ -136,33 +714,11 @@ def _openrouter_prompt(payload: dict, report_text: str, *, page_numbers: list[in
             + (f"out of {total_pages}. " if total_pages else ". ")
             + "Preserve page order and do not mix the beginning and the end of the report.\n"
         )
-
-    ocr_guidance = (
-        "2) OCR text is the PRIMARY source for names/values/units/ranges. Images are SECONDARY and should be used to validate layout and recover missed rows.\n"
-        if not AI_VISUAL_ONLY_MODE else
-        "2) OCR is disabled for this run. Use only the provided images and page ordering.\n"
-    )
     ocr_payload_text = report_text if (report_text and not AI_VISUAL_ONLY_MODE) else "[OCR disabled or unavailable]"
 
     return (
-        "You are a medical lab report extraction assistant. Extract data exhaustively, not selectively. "
-        "Return ONLY valid JSON with this schema: "
-        "{\"biomarkers\":[{\"name\":\"string\",\"value\":\"string\",\"status\":\"Optimal|High|Low|Unknown\",\"explanation\":\"string\"}],"
-        "\"recommendations\":[{\"name\":\"string\",\"protocol\":\"string\",\"reason\":\"string\"}],"
-        "\"summary\":\"string\",\"disclaimer\":\"string\"}. "
-        "Do not include markdown fences.\n"
-        "Rules:\n"
-        "1) Extract ALL visible lab rows/test results, including normal values (do not return only abnormal values).\n"
-        f"{ocr_guidance}"
-        "3) Preserve on-page reading order and page order.\n"
-        "4) If a test name appears on one page and its value/reference range continues on the next page, combine them into one biomarker entry.\n"
-        "5) If the same biomarker appears multiple times for different dates/panels, keep separate entries and mention date/panel/page in explanation.\n"
-        "6) If a row is partially unreadable but identifiable, include it with status=Unknown and explain what is missing.\n"
-        "7) Do not invent values, units, or ranges.\n"
-        "8) Do not emit duplicates caused by overlapping stitched page groups. Merge exact duplicates.\n"
-        "9) Keep explanations short and factual.\n"
-        "10) Summary must mention extraction coverage (e.g., full/partial) and any unreadable sections.\n\n"
-        f"User profile context: {json.dumps(safe_profile, ensure_ascii=False)}\n"
+        f"{_PROMPT_RULES}"
+        f"User profile context: {_profile_context_json(payload)}\n"
         f"{page_context}"
         f"Report text (OCR): {ocr_payload_text}\n"
     )
@@ -182,33 +738,50 @@ def _openrouter_user_content(
     }]
     if AI_OCR_ONLY_MODE:
         return content
-    images = images_override if images_override is not None else payload.get("images", [])
+    images = images_override if images_override is not None else _extract_images(payload)
     stitched_groups = _extract_stitched_page_groups(payload)
-    if isinstance(images, list):
-        for idx, encoded in enumerate(images):
-            if not isinstance(encoded, str) or not encoded.strip():
-                continue
-            page_label = None
-            if page_numbers and idx < len(page_numbers):
-                page_label = page_numbers[idx]
-            elif images_override is None:
-                page_label = idx + 1
-            if page_label is not None:
-                group_text = ""
-                if idx < len(stitched_groups):
-                    group_text = f" (covers raw pages {stitched_groups[idx]})"
-                content.append({
-                    "type": "text",
-                    "text": (f"Image group {page_label}" + (f" of {total_pages}" if total_pages else "")) + group_text,
-                })
-            # App uploads JPEG base64; pass as data URL for vision models.
+    for idx, encoded in enumerate(images):
+        if not encoded:
+            continue
+        page_label = None
+        if page_numbers and idx < len(page_numbers):
+            page_label = page_numbers[idx]
+        elif images_override is None:
+            page_label = idx + 1
+        if page_label is not None:
+            group_text = ""
+            if idx < len(stitched_groups):
+                group_text = f" (covers raw pages {stitched_groups[idx]})"
             content.append({
-                "type": "image_url",
-                "image_url": {"url": f"data:image/jpeg;base64,{encoded.strip()}"},
+                "type": "text",
+                "text": (f"Image group {page_label}" + (f" of {total_pages}" if total_pages else "")) + group_text,
             })
+        content.append(_image_content_item(encoded))
     return content
 
 
+# Keyed by the base64 string itself, so re-submitted reports (app retries) reuse the work across requests.
+@functools.lru_cache(maxsize=OPENROUTER_IMAGE_CACHE_SIZE)
+def _image_content_item(encoded: str) -> dict:
+    # App uploads JPEG base64; pass as data URL for vision models. Shared between requests: do not mutate.
+    return {"type": "image_url", "image_url": {"url": f"data:image/jpeg;base64,{encoded}"}}
+
+
+@functools.lru_cache(maxsize=OPENROUTER_IMAGE_CACHE_SIZE)
+def _encoded_image_item(url: str) -> bytes:
+    # Multi-MB base64 fragments are invariant across attempts; escape/encode them once and splice the bytes.
+    return _json_dumps({"type": "image_url", "image_url": {"url": url}})
+
+
+def _encode_content_item(item: dict) -> bytes:
+    if item.get("type") == "image_url":
+        return _encoded_image_item(item["image_url"]["url"])
+    return _json_dumps(item)
+
+
+_JSON_FENCE_OPEN_RE = re.compile(r"`+(?:json)?", re.IGNORECASE)
+
+
 def _coerce_openrouter_json(content) -> dict:
     if isinstance(content, str):
         text = content.strip()
@@ -224,25 +797,16 @@ def _coerce_openrouter_json(content) -> dict:
         raise ValueError("Unsupported content format")
 
     if text.startswith("```"):
-        text = text.strip("`")
-        if text.lower().startswith("json"):
-            text = text[4:].strip()
+        # Anchored match on the fence prefix; avoids lower-casing the whole (multi-KB) response.
+        text = text[_JSON_FENCE_OPEN_RE.match(text).end():].rstrip("`")
 
-    parsed = json.loads(text)
+    parsed = _json_loads(text)
     if not isinstance(parsed, dict):
         raise ValueError("Model output is not an object")
     return parsed
 
 
-def _active_provider_api_key() -> str:
-    return QWEN_API_KEY if AI_PROVIDER == "qwen" else OPENROUTER_API_KEY
-
-
-def _active_provider_url() -> str:
-    return QWEN_URL if AI_PROVIDER == "qwen" else OPENROUTER_URL
-
-
-def _active_provider_model_chain() -> list[str]:
+def _build_provider_model_chain() -> tuple[str, ...]:
     if AI_PROVIDER == "qwen":
         chain = [QWEN_PRIMARY_MODEL, QWEN_FALLBACK_MODEL, QWEN_FALLBACK_MODEL_2, QWEN_FALLBACK_MODEL_3]
     else:
@@ -252,26 +816,66 @@ def _active_provider_model_chain() -> list[str]:
             OPENROUTER_FALLBACK_MODEL_2,
             OPENROUTER_FALLBACK_MODEL_3,
         ]
-    return [m for m in chain if isinstance(m, str) and m.strip()]
+    return tuple(m for m in chain if isinstance(m, str) and m.strip())
 
 
-def _active_provider_model_chain_for_mode() -> list[str]:
-    chain = _active_provider_model_chain()
-    if not AI_OCR_ONLY_MODE:
-        return chain
-    text_first = []
-    for model in chain:
-        lower = model.lower()
-        if "gemma" in lower or ("vl" not in lower and "vision" not in lower):
-            text_first.append(model)
+# Text-oriented models: gemma, or anything not named as a vision ("vl"/"vision") model.
+_TEXT_MODEL_RE = re.compile(r"gemma|^(?!.*(?:vl|vision)).*$", re.IGNORECASE)
+
+
+def _build_text_first_model_chain(chain: tuple[str, ...]) -> tuple[str, ...]:
+    text_first = [model for model in chain if _TEXT_MODEL_RE.search(model)]
     for model in chain:
         if model not in text_first:
             text_first.append(model)
-    return text_first
+    return tuple(text_first)
+
+
+# Provider settings are fixed per process; resolve them once instead of on every model attempt.
+_PROVIDER_API_KEY = QWEN_API_KEY if AI_PROVIDER == "qwen" else OPENROUTER_API_KEY
+_PROVIDER_URL = QWEN_URL if AI_PROVIDER == "qwen" else OPENROUTER_URL
+_MODEL_CHAIN_NORMAL = _build_provider_model_chain()
+_MODEL_CHAIN_OCR_ONLY = _build_text_first_model_chain(_MODEL_CHAIN_NORMAL)
+_HEADERS_BY_PROVIDER = {
+    "openrouter": {
+        "Content-Type": "application/json",
+        "Authorization": f"Bearer {OPENROUTER_API_KEY}",
+        "HTTP-Referer": OPENROUTER_APP_URL,
+        "X-Title": OPENROUTER_APP_NAME,
+    },
+    "qwen": {
+        "Content-Type": "application/json",
+        "Authorization": f"Bearer {QWEN_API_KEY}",
+    },
+}
+_PROVIDER_HEADERS = _HEADERS_BY_PROVIDER["qwen" if AI_PROVIDER == "qwen" else "openrouter"]
+
+
+def _active_provider_api_key() -> str:
+    return _PROVIDER_API_KEY
+
+
+def _active_provider_url() -> str:
+    return _PROVIDER_URL
 
 
-def _call_openrouter_model(
-    model: str,
+def _active_provider_model_chain_for_mode() -> tuple[str, ...]:
+    return _MODEL_CHAIN_OCR_ONLY if AI_OCR_ONLY_MODE else _MODEL_CHAIN_NORMAL
+
+
+_USER_CONTENT_PLACEHOLDER = "@@USER_CONTENT@@"
+# Everything around the user content is fixed per process; split the encoded body so content can be spliced in.
+_REQUEST_BODY_HEAD, _REQUEST_BODY_TAIL = _json_dumps({
+    "messages": [
+        {"role": "system", "content": "Return strictly valid JSON only."},
+        {"role": "user", "content": _USER_CONTENT_PLACEHOLDER},
+    ],
+    "temperature": 0.1,
+    "max_tokens": OPENROUTER_MAX_TOKENS,
+})[:-1].split(_json_dumps(_USER_CONTENT_PLACEHOLDER))
+
+
+def _prepare_openrouter_request(
     payload: dict,
     report_text: str,
     *,
@@ -280,7 +884,11 @@ def _call_openrouter_model(
     total_pages: int | None = None,
     prompt_override: str | None = None,
     user_content_override: list[dict] | None = None,
-) -> dict:
+) -> bytes:
+    """Serialize the request body once per batch; only the model differs between fallback attempts.
+
+    Returns the encoded body without its closing brace; `_call_openrouter_model` appends the model field.
+    """
     user_content = user_content_override if user_content_override is not None else _openrouter_user_content(
         payload,
         report_text,
@@ -291,26 +899,80 @@ def _call_openrouter_model(
     if prompt_override is not None:
         user_content = [{"type": "text", "text": prompt_override}] + [c for c in user_content if c.get("type") == "image_url"]
 
-    body = {
-        "model": model,
-        "messages": [
-            {"role": "system", "content": "Return strictly valid JSON only."},
-            {"role": "user", "content": user_content},
-        ],
-        "temperature": 0.1,
-        "max_tokens": OPENROUTER_MAX_TOKENS,
-    }
-    data = json.dumps(body).encode("utf-8")
-    req = urllib.request.Request(_active_provider_url(), data=data, method="POST")
-    req.add_header("Content-Type", "application/json")
-    req.add_header("Authorization", f"Bearer {_active_provider_api_key()}")
-    if AI_PROVIDER == "openrouter":
-        req.add_header("HTTP-Referer", OPENROUTER_APP_URL)
-        req.add_header("X-Title", OPENROUTER_APP_NAME)
-
-    with urllib.request.urlopen(req, timeout=OPENROUTER_TIMEOUT_SECONDS) as resp:
-        raw = resp.read()
-        parsed = json.loads(raw.decode("utf-8"))
+    # One join over all pieces, so the multi-MB image data is copied into the body exactly once.
+    parts = [_REQUEST_BODY_HEAD, b"["]
+    for i, item in enumerate(user_content):
+        if i:
+            parts.append(b", ")
+        parts.append(_encode_content_item(item))
+    parts += (b"]", _REQUEST_BODY_TAIL)
+    return b"".join(parts)
+
+
+_CANCELLED_MESSAGE = "cancelled (another model answered first)"
+
+
+def _read_streamed_content(resp, cancel_event: _CancelEvent | None) -> str:
+    parts = []
+    for line in resp:
+        if cancel_event is not None and cancel_event.is_set():
+            raise RuntimeError(_CANCELLED_MESSAGE)
+        # SSE: keep-alive comments (": ...") and blank separators carry no data.
+        if not line.startswith(b"data:"):
+            continue
+        data = line[5:].strip()
+        if data == b"[DONE]":
+            # Drain the chunked terminator so the connection can be reused.
+            resp.read()
+            break
+        event = _json_loads(data)
+        if isinstance(event.get("error"), dict):
+            raise ValueError(f"Provider stream error: {event['error'].get('message', event['error'])}")
+        choices = event.get("choices")
+        if not isinstance(choices, list) or not choices or not isinstance(choices[0], dict):
+            continue
+        delta = choices[0].get("delta")
+        if isinstance(delta, dict) and isinstance(delta.get("content"), str):
+            parts.append(delta["content"])
+    if not parts:
+        raise ValueError("OpenRouter stream returned no content")
+    return "".join(parts)
+
+
+def _call_openrouter_model(model: str, request_template: bytes, *, cancel_event: _CancelEvent | None = None) -> dict:
+    stream_field = b', "stream": true' if OPENROUTER_STREAM_RESPONSES else b""
+    data = b"".join((request_template, stream_field, b', "model": ', _json_dumps(model), b"}"))
+    # Checked before queueing for a slot, so a tripped model is skipped at once even while slots are taken.
+    breaker = _circuit_breaker(model)
+    if not breaker.allow():
+        raise RuntimeError("circuit_open (skipped after repeated provider failures)")
+    if not _PROVIDER_SEMAPHORE.acquire(timeout=OPENROUTER_QUEUE_TIMEOUT_SECONDS):
+        breaker.abandon()
+        raise _ProviderBusyError(f"provider_busy (no upstream slot within {OPENROUTER_QUEUE_TIMEOUT_SECONDS}s)")
+    try:
+        # A hedged attempt may have queued on the semaphore after another model already answered.
+        if cancel_event is not None and cancel_event.is_set():
+            breaker.abandon()
+            raise RuntimeError(_CANCELLED_MESSAGE)
+        try:
+            if OPENROUTER_STREAM_RESPONSES:
+                with _HTTP_POOL.open("POST", _active_provider_url(), data, _PROVIDER_HEADERS, cancel_event=cancel_event) as resp:
+                    streamed_content = _read_streamed_content(resp, cancel_event)
+            else:
+                raw = _HTTP_POOL.request("POST", _active_provider_url(), data, _PROVIDER_HEADERS, cancel_event=cancel_event)
+        except Exception as e:
+            if cancel_event is not None and cancel_event.is_set():
+                # Another model answered and this socket was shut down; not a provider failure.
+                breaker.abandon()
+                raise RuntimeError(_CANCELLED_MESSAGE) from e
+            breaker.record(succeeded=not _is_provider_outage(e))
+            raise
+        breaker.record(succeeded=True)
+    finally:
+        _PROVIDER_SEMAPHORE.release()
+    if OPENROUTER_STREAM_RESPONSES:
+        return _coerce_openrouter_json(streamed_content)
+    parsed = _json_loads(raw)
 
     choices = parsed.get("choices")
     if not isinstance(choices, list) or not choices:
@@ -321,6 +983,110 @@ def _call_openrouter_model(
     return _coerce_openrouter_json(message.get("content"))
 
 
+def _format_model_error(model: str, error: Exception, *, body_limit: int = 300) -> str:
+    if isinstance(error, urllib.error.HTTPError):
+        try:
+            body = error.read().decode("utf-8", errors="replace")
+        except Exception:
+            body = "<unreadable>"
+        return f"{model}: HTTP {error.code} {body[:body_limit]}"
+    return f"{model}: {error}"
+
+
+def _run_model_chain_inline(models: list[str], attempt) -> tuple[dict | None, str]:
+    # Without hedging only one attempt is ever running, so it runs on the caller's thread: no executor
+    # per chain, and nothing non-daemon for interpreter exit to join.
+    errors = []
+    outages = 0
+    delay = 0.0
+    for model in models:
+        if delay > 0:
+            time.sleep(delay)
+        try:
+            return attempt(model, None), model
+        except _ProviderBusyError:
+            raise
+        except Exception as e:
+            errors.append(_format_model_error(model, e))
+            if _is_provider_outage(e):
+                outages += 1
+                delay = _backoff_delay(outages)
+            else:
+                delay = 0.0
+    return None, " | ".join(errors)
+
+
+def _run_hedged_model_chain(models, attempt) -> tuple[dict | None, str]:
+    """Run `attempt(model, cancel_event)` down the chain; return (result, model) or (None, joined errors).
+
+    The next model starts as soon as an attempt fails (after a jittered backoff if the failure was a
+    provider outage), or speculatively once the running attempts exceed OPENROUTER_HEDGE_DELAY_SECONDS.
+    The first successful answer wins.
+    """
+    models = list(models)
+    if not models:
+        return None, ""
+    if OPENROUTER_HEDGE_DELAY_SECONDS <= 0:
+        return _run_model_chain_inline(models, attempt)
+    cancel_event = _CancelEvent()
+    errors: dict[int, str] = {}
+    pending = {}
+    outages = 0
+    executor = ThreadPoolExecutor(max_workers=len(models))
+
+    def run_attempt(model: str, delay: float) -> dict:
+        # Waiting on the cancel event lets a backed-off attempt stop early once another model has answered.
+        if delay > 0 and cancel_event.wait(delay):
+            raise RuntimeError(_CANCELLED_MESSAGE)
+        return attempt(model, cancel_event)
+
+    def launch_next(delay: float = 0.0) -> None:
+        idx = len(errors) + len(pending)
+        if idx < len(models):
+            pending[executor.submit(run_attempt, models[idx], delay)] = idx
+
+    try:
+        launch_next()
+        while pending:
+            more_left = len(errors) + len(pending) < len(models)
+            done, _ = wait(pending, timeout=OPENROUTER_HEDGE_DELAY_SECONDS if more_left else None, return_when=FIRST_COMPLETED)
+            if not done:
+                launch_next()
+                continue
+            for future in done:
+                idx = pending.pop(future)
+                try:
+                    return future.result(), models[idx]
+                except _ProviderBusyError:
+                    raise
+                except Exception as e:
+                    errors[idx] = _format_model_error(models[idx], e)
+                    if _is_provider_outage(e):
+                        outages += 1
+                        launch_next(_backoff_delay(outages))
+                    else:
+                        launch_next()
+        return None, " | ".join(errors[i] for i in sorted(errors))
+    finally:
+        # Losing attempts finish in the background; their results are dropped.
+        cancel_event.set()
+        executor.shutdown(wait=False, cancel_futures=True)
+
+
+_DEDUP_KEY_FIELD = "_dedup_key"
+
+
+def _public_output(normalized: dict) -> dict:
+    # Drop internal biomarker fields before a result is shown to a model or returned to the app.
+    return {
+        **normalized,
+        "biomarkers": [
+            {k: v for k, v in item.items() if k != _DEDUP_KEY_FIELD}
+            for item in normalized.get("biomarkers", [])
+        ],
+    }
+
+
 def _normalize_ai_output(result: dict) -> dict:
     biomarkers = result.get("biomarkers")
     recommendations = result.get("recommendations")
@@ -333,11 +1099,15 @@ def _normalize_ai_output(result: dict) -> dict:
     for item in biomarkers:
         if not isinstance(item, dict):
             continue
+        name = str(item.get("name", "")).strip() or "Unknown"
+        value = str(item.get("value", "")).strip() or "N/A"
         normalized_biomarkers.append({
-            "name": str(item.get("name", "")).strip() or "Unknown",
-            "value": str(item.get("value", "")).strip() or "N/A",
+            "name": name,
+            "value": value,
             "status": str(item.get("status", "Unknown")).strip() or "Unknown",
             "explanation": str(item.get("explanation", "")).strip() or "No explanation provided.",
+            # Canonical dedupe key, computed once here and reused by every dedupe/merge pass.
+            _DEDUP_KEY_FIELD: (name.lower(), value.lower()),
         })
 
     normalized_recommendations = []
@@ -359,96 +1129,96 @@ def _normalize_ai_output(result: dict) -> dict:
     return _dedupe_normalized_output(normalized)
 
 
-def _dedupe_normalized_output(normalized: dict) -> dict:
-    biomarkers = normalized.get("biomarkers", []) if isinstance(normalized.get("biomarkers"), list) else []
-    recommendations = normalized.get("recommendations", []) if isinstance(normalized.get("recommendations"), list) else []
+# Items reaching the dedupe/merge helpers were built by _normalize_ai_output, so fields are stripped strings.
+def _biomarker_key(item: dict) -> tuple[str, str]:
+    return item[_DEDUP_KEY_FIELD]
 
-    deduped_biomarkers = []
-    seen_biomarkers = {}
+
+def _recommendation_key(item: dict) -> tuple[str, str]:
+    return item["name"].lower(), item["protocol"].lower()
+
+
+def _add_biomarkers(by_key: dict[tuple[str, str], dict], biomarkers, seen_with_status: set | None = None) -> None:
     for item in biomarkers:
-        if not isinstance(item, dict):
-            continue
-        key = (
-            str(item.get("name", "")).strip().lower(),
-            str(item.get("value", "")).strip().lower(),
-        )
-        if key in seen_biomarkers:
-            existing = seen_biomarkers[key]
-            if len(str(item.get("explanation", ""))) > len(str(existing.get("explanation", ""))):
-                existing["explanation"] = item.get("explanation", existing.get("explanation", ""))
+        key = _biomarker_key(item)
+        if seen_with_status is not None:
+            # Merging chunks: an identical name/value/status row from a later chunk carries nothing new.
+            status_key = (key, item["status"].lower())
+            if status_key in seen_with_status:
+                continue
+            seen_with_status.add(status_key)
+        existing = by_key.get(key)
+        if existing is not None:
+            if len(item["explanation"]) > len(existing["explanation"]):
+                existing["explanation"] = item["explanation"]
             # Prefer a specific status if previous is Unknown.
-            if str(existing.get("status", "")).strip().lower() == "unknown" and str(item.get("status", "")).strip():
-                existing["status"] = item.get("status")
+            if existing["status"].lower() == "unknown" and item["status"]:
+                existing["status"] = item["status"]
             continue
-        clone = dict(item)
-        seen_biomarkers[key] = clone
-        deduped_biomarkers.append(clone)
+        by_key[key] = dict(item)
 
-    deduped_recommendations = []
-    seen_recos = set()
+
+def _add_recommendations(by_key: dict[tuple[str, str], dict], recommendations) -> None:
     for item in recommendations:
-        if not isinstance(item, dict):
-            continue
-        key = (
-            str(item.get("name", "")).strip().lower(),
-            str(item.get("protocol", "")).strip().lower(),
-        )
-        if key in seen_recos:
-            continue
-        seen_recos.add(key)
-        deduped_recommendations.append(dict(item))
+        key = _recommendation_key(item)
+        if key not in by_key:
+            by_key[key] = dict(item)
 
-    normalized["biomarkers"] = deduped_biomarkers
-    normalized["recommendations"] = deduped_recommendations
-    return normalized
 
+def _dedupe_biomarkers(biomarkers) -> list[dict]:
+    by_key: dict[tuple[str, str], dict] = {}
+    _add_biomarkers(by_key, biomarkers, None)
+    return list(by_key.values())
 
-def _merge_normalized_outputs(chunks: list[dict]) -> dict:
-    if not chunks:
-        raise ValueError("No chunk outputs to merge")
-
-    seen_biomarkers = set()
-    merged_biomarkers = []
-    for chunk in chunks:
-        for item in chunk.get("biomarkers", []):
-            key = (
-                str(item.get("name", "")).strip().lower(),
-                str(item.get("value", "")).strip().lower(),
-                str(item.get("status", "")).strip().lower(),
-            )
-            if key in seen_biomarkers:
-                continue
-            seen_biomarkers.add(key)
-            merged_biomarkers.append(item)
-
-    seen_recos = set()
-    merged_recommendations = []
-    for chunk in chunks:
-        for item in chunk.get("recommendations", []):
-            key = (
-                str(item.get("name", "")).strip().lower(),
-                str(item.get("protocol", "")).strip().lower(),
-            )
-            if key in seen_recos:
-                continue
-            seen_recos.add(key)
-            merged_recommendations.append(item)
 
-    # Keep the latest chunk summary if available; prepend note about multi-page batching.
-    last_summary = next((c.get("summary", "").strip() for c in reversed(chunks) if isinstance(c.get("summary"), str) and c.get("summary").strip()), "")
-    summary = f"Analyzed report pages in order across {len(chunks)} batch(es)." + (f" {last_summary}" if last_summary else "")
+def _dedupe_recommendations(recommendations) -> list[dict]:
+    by_key: dict[tuple[str, str], dict] = {}
+    _add_recommendations(by_key, recommendations)
+    return list(by_key.values())
 
-    disclaimer = next(
-        (c.get("disclaimer", "").strip() for c in chunks if isinstance(c.get("disclaimer"), str) and c.get("disclaimer").strip()),
-        "DISCLAIMER: This is not medical advice. Consult a healthcare provider before use.",
-    )
 
-    return _dedupe_normalized_output({
-        "biomarkers": merged_biomarkers,
-        "recommendations": merged_recommendations,
-        "summary": summary,
-        "disclaimer": disclaimer,
-    })
+def _dedupe_normalized_output(normalized: dict) -> dict:
+    normalized["biomarkers"] = _dedupe_biomarkers(normalized["biomarkers"])
+    normalized["recommendations"] = _dedupe_recommendations(normalized["recommendations"])
+    return normalized
+
+
+class _OutputMerger:
+    """Folds normalized chunk outputs in page order as they arrive; only the merged rows are kept."""
+
+    def __init__(self) -> None:
+        self._biomarkers: dict[tuple[str, str], dict] = {}
+        self._seen_with_status: set = set()
+        self._recommendations: dict[tuple[str, str], dict] = {}
+        self._last_summary = ""
+        self._disclaimer = ""
+        self._chunks = 0
+
+    def add(self, chunk: dict) -> None:
+        self._chunks += 1
+        _add_biomarkers(self._biomarkers, chunk["biomarkers"], self._seen_with_status)
+        _add_recommendations(self._recommendations, chunk["recommendations"])
+        # Keep the latest chunk summary and the first chunk disclaimer.
+        candidate = chunk.get("summary")
+        if isinstance(candidate, str) and candidate.strip():
+            self._last_summary = candidate.strip()
+        candidate = chunk.get("disclaimer")
+        if not self._disclaimer and isinstance(candidate, str) and candidate.strip():
+            self._disclaimer = candidate.strip()
+
+    def result(self) -> dict:
+        if not self._chunks:
+            raise ValueError("No chunk outputs to merge")
+        # Prepend note about multi-page batching.
+        summary = f"Analyzed report pages in order across {self._chunks} batch(es)." + (
+            f" {self._last_summary}" if self._last_summary else ""
+        )
+        return {
+            "biomarkers": list(self._biomarkers.values()),
+            "recommendations": list(self._recommendations.values()),
+            "summary": summary,
+            "disclaimer": self._disclaimer or "DISCLAIMER: This is not medical advice. Consult a healthcare provider before use.",
+        }
 
 
 def _is_suspiciously_incomplete(normalized: dict, image_count: int) -> bool:
@@ -462,7 +1232,42 @@ def _is_suspiciously_incomplete(normalized: dict, image_count: int) -> bool:
     return False
 
 
+def _is_complete(normalized: dict, payload: dict, page_numbers: list[int]) -> bool:
+    # Beyond the row-count heuristic this needs filled-in sections and OCR evidence for every page;
+    # without per-page OCR text nothing can be verified, so reconciliation runs as before.
+    biomarkers = normalized.get("biomarkers")
+    if not isinstance(biomarkers, list) or not biomarkers:
+        return False
+    if not normalized.get("recommendations") or not isinstance(normalized.get("recommendations"), list):
+        return False
+    if not normalized.get("summary"):
+        return False
+    if len(biomarkers) < OPENROUTER_MIN_BIOMARKERS_PER_IMAGE_HINT * max(1, len(page_numbers)):
+        return False
+    by_page = _report_text_page_index(payload)
+    if not by_page:
+        return False
+    names = [str(b.get("name", "")).strip().lower() for b in biomarkers if isinstance(b, dict)]
+    names = [name for name in names if name]
+    for image_page in page_numbers:
+        raw_pages = _raw_pages_covered_by_image_indices(payload, [image_page])
+        page_text = " ".join(by_page.get(page, "") for page in raw_pages).lower()
+        # Every page in the batch must be accounted for by at least one extracted row.
+        if not page_text.strip() or not any(name in page_text for name in names):
+            return False
+    return True
+
+
 def _raw_pages_covered_by_image_indices(payload: dict, image_indices_1based: list[int]) -> list[int]:
+    return _payload_memoized(payload, "_raw_pages_covered", image_indices_1based, _compute_raw_pages_covered)
+
+
+def _report_text_subset_for_images(payload: dict, image_indices_1based: list[int]) -> str:
+    # Retries, hedged attempts and reconciliation ask for the same page subsets repeatedly.
+    return _payload_memoized(payload, "_report_text_subsets", image_indices_1based, _build_report_text_subset)
+
+
+def _compute_raw_pages_covered(payload: dict, image_indices_1based: list[int]) -> list[int]:
     groups = _extract_stitched_page_groups(payload)
     covered = []
     if groups:
@@ -471,14 +1276,14 @@ def _raw_pages_covered_by_image_indices(payload: dict, image_indices_1based: lis
                 covered.extend(groups[img_idx - 1])
     else:
         covered.extend(image_indices_1based)
-    return sorted(set(int(p) for p in covered if int(p) > 0))
+    return sorted(set(p for p in covered if p > 0))
 
 
-def _report_text_subset_for_images(payload: dict, image_indices_1based: list[int]) -> str:
-    by_page = _extract_report_text_by_page(payload)
+def _build_report_text_subset(payload: dict, image_indices_1based: list[int]) -> str:
+    by_page = _report_text_page_index(payload)
     if by_page:
-        target_pages = set(_raw_pages_covered_by_image_indices(payload, image_indices_1based))
-        parts = [f"[Page {item['page']}]\n{item['text']}" for item in by_page if item["page"] in target_pages]
+        target_pages = _raw_pages_covered_by_image_indices(payload, image_indices_1based)
+        parts = [by_page[page] for page in target_pages if page in by_page]
         if parts:
             return "\n\n".join(parts)
     return _extract_report_text(payload)
@@ -500,7 +1305,7 @@ def _reconciliation_prompt(extracted_json: dict, report_text: str, *, page_numbe
         "5) Preserve order as much as possible.\n\n"
         f"{page_context}"
         f"OCR text:\n{report_text}\n\n"
-        f"Existing extracted JSON:\n{json.dumps(extracted_json, ensure_ascii=False)}\n"
+        f"Existing extracted JSON:\n{_json_dumps(_public_output(extracted_json)).decode('utf-8')}\n"
     )
 
 
@@ -522,7 +1327,7 @@ def _recommendation_synthesis_prompt(extracted_json: dict, report_text: str) ->
         "7) Summary should explain what the labs suggest and mention if extraction appears partial.\n"
         "8) Do not invent lab values.\n\n"
         f"OCR text (context, may be partial):\n{report_text or '[OCR unavailable]'}\n\n"
-        f"Extracted JSON:\n{json.dumps(extracted_json, ensure_ascii=False)}\n"
+        f"Extracted JSON:\n{_json_dumps(_public_output(extracted_json)).decode('utf-8')}\n"
     )
 
 
@@ -536,36 +1341,31 @@ def maybe_generate_with_openrouter(payload: dict) -> tuple[dict | None, str | No
 
     model_chain = _active_provider_model_chain_for_mode()
 
-    images = payload.get("images", [])
-    if not isinstance(images, list):
-        images = []
+    images = _extract_images(payload)
     if AI_OCR_ONLY_MODE and not (report_text.strip() or _extract_report_text_by_page(payload)):
         return None, f"{provider_label} OCR-only mode enabled but no OCR text was provided"
 
     def run_model_chain_for_images(images_subset: list[str], page_numbers: list[int], total_pages: int) -> tuple[dict | None, str | None]:
         report_text_subset = "" if AI_VISUAL_ONLY_MODE else _report_text_subset_for_images(payload, page_numbers)
-        errors_local = []
-        for model in model_chain:
-            try:
-                raw = _call_openrouter_model(
-                    model,
-                    payload,
-                    report_text_subset or report_text,
-                    images_override=images_subset,
-                    page_numbers=page_numbers,
-                    total_pages=total_pages,
-                )
-                normalized = _normalize_ai_output(raw)
-                return normalized, model
-            except urllib.error.HTTPError as e:
-                try:
-                    body = e.read().decode("utf-8", errors="replace")
-                except Exception:
-                    body = "<unreadable>"
-                errors_local.append(f"{model}: HTTP {e.code} {body[:300]}")
-            except Exception as e:
-                errors_local.append(f"{model}: {e}")
-        return None, " | ".join(errors_local)
+        request_template = _prepare_openrouter_request(
+            payload,
+            report_text_subset or report_text,
+            images_override=images_subset,
+            page_numbers=page_numbers,
+            total_pages=total_pages,
+        )
+
+        def attempt(model: str, cancel_event: _CancelEvent | None) -> dict:
+            return _normalize_ai_output(_call_openrouter_model(model, request_template, cancel_event=cancel_event))
+
+        if len(images_subset) != 1 or not OPENROUTER_CACHE_PAGE_RESULTS:
+            return _run_hedged_model_chain(model_chain, attempt)
+        # Single-page reads (completeness retries, one-page batches) repeat whenever a report is re-submitted.
+        return _RESULT_CACHE.get_or_compute(
+            _request_fingerprint("page", request_template),
+            lambda: _run_hedged_model_chain(model_chain, attempt),
+            cacheable=lambda result: result[0] is not None,
+        )
 
     def run_reconciliation_chain_for_images(
         images_subset: list[str],
@@ -586,115 +1386,160 @@ def maybe_generate_with_openrouter(payload: dict) -> tuple[dict | None, str | No
 
         report_text_subset = _report_text_subset_for_images(payload, page_numbers) if not AI_VISUAL_ONLY_MODE else ""
         prompt = _reconciliation_prompt(extracted, report_text_subset, page_numbers=page_numbers, total_pages=total_pages)
-        errors_local = []
-        for model in recon_models:
-            try:
-                raw = _call_openrouter_model(
-                    model,
-                    payload,
-                    report_text_subset,
-                    images_override=images_subset,
-                    page_numbers=page_numbers,
-                    total_pages=total_pages,
-                    prompt_override=prompt,
-                )
-                normalized = _normalize_ai_output(raw)
-                return normalized, model
-            except urllib.error.HTTPError as e:
+        request_template = _prepare_openrouter_request(
+            payload,
+            report_text_subset,
+            images_override=images_subset,
+            page_numbers=page_numbers,
+            total_pages=total_pages,
+            prompt_override=prompt,
+        )
+
+        def reconcile() -> tuple[dict | None, str | None]:
+            errors_local = []
+            for model in recon_models:
                 try:
-                    body = e.read().decode("utf-8", errors="replace")
-                except Exception:
-                    body = "<unreadable>"
-                errors_local.append(f"{model}: HTTP {e.code} {body[:300]}")
-            except Exception as e:
-                errors_local.append(f"{model}: {e}")
-        return extracted, " | ".join(errors_local) if errors_local else None
+                    raw = _call_openrouter_model(model, request_template)
+                    return _normalize_ai_output(raw), model
+                except _ProviderBusyError:
+                    raise
+                except Exception as e:
+                    errors_local.append(_format_model_error(model, e))
+            return None, " | ".join(errors_local) if errors_local else None
+
+        normalized, info = _RESULT_CACHE.get_or_compute(
+            _request_fingerprint("reconciliation", request_template),
+            reconcile,
+            cacheable=lambda result: result[0] is not None,
+        )
+        if normalized is None:
+            return extracted, info
+        return normalized, info
 
     def run_summary_recommendation_synthesis(extracted: dict) -> tuple[dict, str | None]:
         # Final pass improves summary/recommendation quality and dosing detail using full extracted biomarkers.
         report_text_full = "" if AI_VISUAL_ONLY_MODE else (_extract_report_text(payload) or "")
         prompt = _recommendation_synthesis_prompt(extracted, report_text_full)
         synth_models = _active_provider_model_chain_for_mode()
-        errors_local = []
-        for model in synth_models:
-            try:
-                raw = _call_openrouter_model(
-                    model,
-                    payload,
-                    report_text_full,
-                    images_override=[],
-                    page_numbers=[],
-                    total_pages=0,
-                    prompt_override=prompt,
-                )
-                normalized = _normalize_ai_output(raw)
-                # Keep extracted biomarkers as source of truth; only take synthesized summary/recommendations/disclaimer.
-                extracted["recommendations"] = normalized.get("recommendations", extracted.get("recommendations", []))
-                extracted["summary"] = normalized.get("summary", extracted.get("summary", ""))
-                extracted["disclaimer"] = normalized.get("disclaimer", extracted.get("disclaimer", ""))
-                return _dedupe_normalized_output(extracted), model
-            except urllib.error.HTTPError as e:
+        request_template = _prepare_openrouter_request(
+            payload,
+            report_text_full,
+            images_override=[],
+            page_numbers=[],
+            total_pages=0,
+            prompt_override=prompt,
+        )
+
+        def synthesize() -> tuple[dict | None, str | None]:
+            errors_local = []
+            for model in synth_models:
                 try:
-                    body = e.read().decode("utf-8", errors="replace")
-                except Exception:
-                    body = "<unreadable>"
-                errors_local.append(f"{model}: HTTP {e.code} {body[:220]}")
-            except Exception as e:
-                errors_local.append(f"{model}: {e}")
-        return extracted, (" | ".join(errors_local) if errors_local else None)
+                    raw = _call_openrouter_model(model, request_template)
+                    return _normalize_ai_output(raw), model
+                except _ProviderBusyError:
+                    raise
+                except Exception as e:
+                    errors_local.append(_format_model_error(model, e, body_limit=220))
+            return None, (" | ".join(errors_local) if errors_local else None)
+
+        normalized, info = _RESULT_CACHE.get_or_compute(
+            _request_fingerprint("synthesis", request_template),
+            synthesize,
+            cacheable=lambda result: result[0] is not None,
+        )
+        if normalized is None:
+            return extracted, info
+        # Keep extracted biomarkers as source of truth; only take synthesized summary/recommendations/disclaimer.
+        extracted["recommendations"] = normalized.get("recommendations", extracted.get("recommendations", []))
+        extracted["summary"] = normalized.get("summary", extracted.get("summary", ""))
+        extracted["disclaimer"] = normalized.get("disclaimer", extracted.get("disclaimer", ""))
+        return _dedupe_normalized_output(extracted), info
 
     def run_with_completeness_retry(images_subset: list[str], page_numbers: list[int], total_pages: int) -> tuple[dict | None, str | None]:
         normalized, model_or_error = run_model_chain_for_images(images_subset, page_numbers, total_pages)
         if normalized is None:
             return None, model_or_error
         if len(images_subset) <= 1 or not _is_suspiciously_incomplete(normalized, len(images_subset)):
+            if not OPENROUTER_FORCE_RECONCILIATION and _is_complete(normalized, payload, page_numbers):
+                # No retries were needed and nothing looks missing; another LLM pass is unlikely to change the result.
+                return normalized, model_or_error
             reconciled, recon_meta = run_reconciliation_chain_for_images(images_subset, page_numbers, total_pages, normalized)
             if recon_meta:
                 return reconciled, f"{model_or_error} | reconciliation:{recon_meta}"
             return reconciled, model_or_error
 
-        print(
-            "mock-backend: completeness retry triggered for pages "
-            f"{page_numbers}; biomarkers={len(normalized.get('biomarkers', []))}"
+        logger.info(
+            "completeness retry triggered for pages %s; biomarkers=%d",
+            page_numbers,
+            len(normalized.get("biomarkers", [])),
         )
-        retry_chunks = []
+        # Single-page retries are independent network calls; run them concurrently and restore page order after.
+        single_results: dict[int, tuple[dict | None, str | None]] = {}
+        with ThreadPoolExecutor(max_workers=min(OPENROUTER_MAX_CONCURRENCY, len(images_subset))) as executor:
+            futures = {
+                executor.submit(run_model_chain_for_images, [img], [page_numbers[i]], total_pages): i
+                for i, img in enumerate(images_subset)
+            }
+            for future in as_completed(futures):
+                single_results[futures[future]] = future.result()
+
+        retry_merger = _OutputMerger()
         retry_models = []
-        for i, img in enumerate(images_subset):
-            single_page = [page_numbers[i]]
-            single_normalized, single_model = run_model_chain_for_images([img], single_page, total_pages)
+        for i in range(len(images_subset)):
+            single_normalized, single_model = single_results[i]
             if single_normalized is None:
                 # Keep original batch result if single-page retries are worse/unavailable.
                 reconciled, recon_meta = run_reconciliation_chain_for_images(images_subset, page_numbers, total_pages, normalized)
                 if recon_meta:
                     return reconciled, f"{model_or_error} | reconciliation:{recon_meta}"
                 return reconciled, model_or_error
-            retry_chunks.append(single_normalized)
+            retry_merger.add(single_normalized)
             retry_models.append(single_model)
 
-        merged_retry = _merge_normalized_outputs(retry_chunks)
-        reconciled, recon_meta = run_reconciliation_chain_for_images(images_subset, page_numbers, total_pages, merged_retry)
+        merged_retry = retry_merger.result()
         meta = f"{model_or_error} (completeness-retry via {' -> '.join(retry_models)})"
+        if OPENROUTER_SKIP_RECONCILE_IF_COMPLETE and _is_complete(merged_retry, payload, page_numbers):
+            # Same evidence as the first-pass skip: every page was re-read and is backed by its OCR text.
+            return merged_retry, meta
+        reconciled, recon_meta = run_reconciliation_chain_for_images(images_subset, page_numbers, total_pages, merged_retry)
         if recon_meta:
             meta += f" | reconciliation:{recon_meta}"
         return reconciled, meta
 
     if not AI_OCR_ONLY_MODE and len(images) > OPENROUTER_PAGE_BATCH_SIZE:
-        chunk_results = []
+        merger = _OutputMerger()
         model_hits = []
         chunk_errors = []
         total_pages = len(images)
+        # Batches are independent until the final merge; run them concurrently and collect in page order.
+        jobs: deque[tuple[list[int], Future]] = deque()
+        # Page numbers appear as lists in prompts and logs; slice one list instead of rebuilding ranges per batch.
+        all_pages = list(range(1, total_pages + 1))
         for start in range(0, total_pages, OPENROUTER_PAGE_BATCH_SIZE):
-            end = min(start + OPENROUTER_PAGE_BATCH_SIZE, total_pages)
+            end = start + OPENROUTER_PAGE_BATCH_SIZE
+            # Images are not decoded; batch slices share the uploaded base64 str objects.
             subset = images[start:end]
-            page_numbers = list(range(start + 1, end + 1))
-            print(f"mock-backend: analyzing page batch {page_numbers} of total_pages={total_pages}")
-            normalized, model_or_error = run_with_completeness_retry(subset, page_numbers, total_pages)
+            page_numbers = all_pages[start:end]
+            logger.info(_BATCH_MSG, page_numbers, total_pages)
+            jobs.append((page_numbers, _BATCH_EXECUTOR.submit(run_with_completeness_retry, subset, page_numbers, total_pages)))
+        while jobs:
+            # Pop each batch before folding it in so its future (and result) is not kept alive until the end.
+            page_numbers, future = jobs.popleft()
+            try:
+                normalized, model_or_error = future.result()
+            except _ProviderBusyError:
+                for _, pending in jobs:
+                    pending.cancel()
+                raise
             if normalized is None:
+                for _, pending in jobs:
+                    pending.cancel()
                 chunk_errors.append(f"pages {page_numbers}: {model_or_error}")
                 return None, f"{provider_label} batch mode failed. " + " | ".join(chunk_errors)
-            chunk_results.append(normalized)
+            # Fold each batch in as it completes (in page order) instead of holding every chunk for one merge.
+            merger.add(normalized)
             model_hits.append(model_or_error)
-        merged = _merge_normalized_outputs(chunk_results)
+        merged = merger.result()
         merged, synth_meta = run_summary_recommendation_synthesis(merged)
         meta = f"{provider_label} batch success (ordered pages) via {' -> '.join(model_hits)}"
         if synth_meta:
@@ -714,81 +1559,300 @@ def maybe_generate_with_openrouter(payload: dict) -> tuple[dict | None, str | No
     return None, f"{provider_label} failed. " + " | ".join(errors)
 
 
-def json_response(handler: BaseHTTPRequestHandler, status: int, payload: dict) -> None:
-    body = json.dumps(payload).encode("utf-8")
+def _read_request_body(rfile, length: int) -> bytearray:
+    # Fill one preallocated buffer; the JSON parser takes bytes directly, so no joined copy or decoded str is built.
+    body = bytearray(length)
+    view = memoryview(body)
+    filled = 0
+    while filled < length:
+        n = rfile.readinto(view[filled:])
+        if not n:
+            raise ValueError("request body ended early")
+        filled += n
+    return body
+
+
+_STATIC_RESPONSE_PAYLOADS = {
+    (200, "health_ok"): {"status": "ok"},
+    (404, "not_found"): {"code": "not_found", "message": "Not found", "retryable": False},
+    (401, "unauthorized"): {"code": "unauthorized", "message": "Missing bearer token", "retryable": False},
+    (403, "forbidden"): {"code": "forbidden", "message": "Token is invalid", "retryable": False},
+    (400, "invalid_json"): {"code": "invalid_json", "message": "Request JSON is invalid", "retryable": False},
+    (411, "length_required"): {"code": "length_required", "message": "Request body needs a Content-Length", "retryable": False},
+    (413, "payload_too_large"): {"code": "payload_too_large", "message": "Request body is too large", "retryable": False},
+    (502, "ai_provider_failed_generic"): {"code": "ai_provider_failed", "message": "AI provider failed", "retryable": True},
+}
+# Fixed response bodies and their Content-Length values, encoded once at import.
+_STATIC_RESPONSES: dict[tuple[int, str], tuple[bytes, str]] = {
+    key: (body, str(len(body)))
+    for key, body in ((key, _json_dumps(payload)) for key, payload in _STATIC_RESPONSE_PAYLOADS.items())
+}
+
+
+def json_response_static(handler: BaseHTTPRequestHandler, status: int, key: str, *, close_connection: bool = False) -> None:
+    body, content_length = _STATIC_RESPONSES[(status, key)]
+    handler.send_response(status)
+    handler.send_header("Content-Type", "application/json")
+    handler.send_header("Content-Length", content_length)
+    if close_connection:
+        handler.send_header("Connection", "close")
+    handler.end_headers()
+    handler.wfile.write(body)
+
+
+def json_response(handler: BaseHTTPRequestHandler, status: int, payload: dict, *, close_connection: bool = False) -> None:
+    body = _json_dumps(payload)
     handler.send_response(status)
     handler.send_header("Content-Type", "application/json")
     handler.send_header("Content-Length", str(len(body)))
+    if close_connection:
+        # The request body was not consumed, so the connection cannot carry another request.
+        handler.send_header("Connection", "close")
     handler.end_headers()
     handler.wfile.write(body)
 
 
 class Handler(BaseHTTPRequestHandler):
     server_version = "VibeCheckMock/1.0"
+    protocol_version = "HTTP/1.1"
+    timeout = BACKEND_REQUEST_TIMEOUT_SECONDS
+    # Buffer wfile so status line, headers and a small body leave in one send; handle_one_request flushes it.
+    wbufsize = -1
+
+    def handle(self) -> None:
+        # Serve what the client has sent, then hand an idle keep-alive connection back to the server.
+        self.parked = False
+        self.handle_one_request()
+        while not self.close_connection:
+            if not self._next_request_buffered():
+                self.parked = not self.close_connection
+                return
+            self.handle_one_request()
+
+    def _next_request_buffered(self) -> bool:
+        # A non-blocking peek never waits: it returns pipelined bytes already sent, or nothing.
+        self.connection.setblocking(False)
+        try:
+            return bool(self.rfile.peek(1))
+        except OSError:
+            self.close_connection = True
+            return False
+        finally:
+            self.connection.settimeout(self.timeout)
 
     def log_message(self, fmt: str, *args) -> None:
         # keep logs minimal and without payload/PII
-        print("mock-backend:", fmt % args)
+        logger.info(fmt, *args)
+
+    def _has_request_body(self) -> bool:
+        return "Transfer-Encoding" in self.headers or self.headers.get("Content-Length", "0").strip() not in ("", "0")
 
     def do_GET(self):
+        # GET bodies are never read; leaving one in the stream would be parsed as the next request.
+        close_connection = self._has_request_body()
         if self.path == "/health":
-            return json_response(self, 200, {"status": "ok"})
-        return json_response(self, 404, {"code": "not_found", "message": "Not found", "retryable": False})
-
-    def do_POST(self):
+            breakers = _circuit_breaker_states()
+            if breakers:
+                return json_response(self, 200, {"status": "ok", "breakers": breakers}, close_connection=close_connection)
+            return json_response_static(self, 200, "health_ok", close_connection=close_connection)
+        return json_response_static(self, 404, "not_found", close_connection=close_connection)
+
+    def _reject_before_body(self) -> tuple[int, str] | None:
+        """Checks that need only the request line and headers; a rejected body is never read."""
+        get_header = self.headers.get
         if self.path != "/v1/analyze-report":
-            return json_response(self, 404, {"code": "not_found", "message": "Not found", "retryable": False})
+            return 404, "not_found"
 
         if REQUIRE_AUTH:
-            auth_header = self.headers.get("Authorization", "")
-            if not auth_header.startswith("Bearer "):
-                return json_response(self, 401, {
-                    "code": "unauthorized",
-                    "message": "Missing bearer token",
-                    "retryable": False,
-                })
-            token = auth_header.replace("Bearer ", "", 1).strip()
-            if token != AUTH_TOKEN:
-                return json_response(self, 403, {
-                    "code": "forbidden",
-                    "message": "Token is invalid",
-                    "retryable": False,
-                })
+            auth_header = get_header("Authorization", "")
+            if not auth_header.startswith(_BEARER):
+                return 401, "unauthorized"
+            # Constant-time compare so response timing does not leak how much of the token matched.
+            token_bytes = auth_header[_BEARER_LEN:].strip().encode("utf-8")
+            if not hmac.compare_digest(token_bytes, AUTH_TOKEN_BYTES):
+                return 403, "forbidden"
+
+        # Only Content-Length framing is read. Any other framing (or a bogus length) would leave body
+        # bytes on a keep-alive connection to be parsed as the next request, so those connections close.
+        if "Transfer-Encoding" in self.headers:
+            return 411, "length_required"
+        if len(self.headers.get_all("Content-Length", ())) > 1:
+            return 400, "invalid_json"
+        raw_length = get_header("Content-Length", "0").strip()
+        # int() would also take "-1", "+5" and "1_0"; Content-Length is plain ASCII digits.
+        if not (raw_length.isascii() and raw_length.isdigit()):
+            return 400, "invalid_json"
+        if int(raw_length) > BACKEND_MAX_BODY_BYTES:
+            return 413, "payload_too_large"
+        return None
+
+    def handle_expect_100(self) -> bool:
+        # Called from parse_request before the client sends the body. Answer a rejection right away so
+        # the upload never starts; otherwise send 100 and flush it, since wfile is buffered.
+        rejection = self._reject_before_body() if self.command == "POST" else None
+        if rejection is not None:
+            json_response_static(self, *rejection, close_connection=True)
+            self.wfile.flush()
+            return False
+        self.send_response_only(100)
+        self.end_headers()
+        self.wfile.flush()
+        return True
+
+    def do_POST(self):
+        rejection = self._reject_before_body()
+        if rejection is not None:
+            return json_response_static(self, *rejection, close_connection=True)
+        length = int(self.headers.get("Content-Length", "0").strip())
 
         try:
-            length = int(self.headers.get("Content-Length", "0"))
-            raw = self.rfile.read(length)
-            payload = json.loads(raw.decode("utf-8") if raw else "{}")
+            raw = _read_request_body(self.rfile, length) if length > 0 else b"{}"
+            payload = _json_loads(raw)
         except Exception:
-            return json_response(self, 400, {
-                "code": "invalid_json",
-                "message": "Request JSON is invalid",
-                "retryable": False,
-            })
+            return json_response_static(self, 400, "invalid_json", close_connection=True)
 
-        images = payload.get("images", [])
-        if not isinstance(images, list) or len(images) == 0:
-            return json_response(self, 400, {
-                "code": "invalid_request",
-                "message": "images must be a non-empty array",
-                "retryable": False,
-            })
+        try:
+            request = _parse_request_payload(payload)
+        except ValueError as e:
+            return json_response(self, 400, {"code": "invalid_request", "message": str(e), "retryable": False})
 
-        response, mode_msg = maybe_generate_with_openrouter(payload)
+        try:
+            response, mode_msg = maybe_generate_with_openrouter(request)
+        except _ProviderBusyError as e:
+            logger.info("%s", e)
+            return json_response(self, 503, {"code": "provider_busy", "message": str(e), "retryable": True})
         if mode_msg:
-            print("mock-backend:", mode_msg)
+            logger.info("%s", mode_msg)
         if response is None:
+            if not mode_msg:
+                return json_response_static(self, 502, "ai_provider_failed_generic")
             return json_response(self, 502, {
                 "code": "ai_provider_failed",
-                "message": mode_msg or "AI provider failed",
+                "message": mode_msg,
                 "retryable": True,
             })
-        return json_response(self, 200, response)
+        return json_response(self, 200, _public_output(response))
+
+
+class PooledHTTPServer(HTTPServer):
+    """HTTP server that hands readable connections to a fixed pool of daemon worker threads.
+
+    New and idle keep-alive connections wait in a selector thread instead of on a worker, so silent
+    clients cannot hold the pool. Workers are daemon threads (as ThreadingHTTPServer's are), so an
+    open client connection never holds up interpreter exit after SIGTERM.
+    """
+
+    def __init__(self, server_address, handler_class, *, max_workers: int, reuse_port: bool = False) -> None:
+        # Read by server_bind() during the base constructor.
+        self.allow_reuse_port = reuse_port
+        super().__init__(server_address, handler_class)
+        self._connections: queue.SimpleQueue = queue.SimpleQueue()
+        self._to_park: queue.SimpleQueue = queue.SimpleQueue()
+        self._closing = False
+        self._wakeup_recv, self._wakeup_send = socket.socketpair()
+        self._selector = selectors.DefaultSelector()
+        self._selector.register(self._wakeup_recv, selectors.EVENT_READ)
+        self._workers = [
+            threading.Thread(target=self._serve_connections, name=f"mock-backend-http-{i}", daemon=True)
+            for i in range(max_workers)
+        ]
+        self._watcher = threading.Thread(target=self._watch_idle_connections, name="mock-backend-idle", daemon=True)
+        for thread in (*self._workers, self._watcher):
+            thread.start()
+
+    def process_request(self, request, client_address) -> None:
+        # A worker is only taken once the client has actually sent something.
+        self._park(request, client_address)
+
+    def finish_request(self, request, client_address) -> bool:
+        handler = self.RequestHandlerClass(request, client_address, self)
+        return getattr(handler, "parked", False)
+
+    def _park(self, request, client_address) -> None:
+        self._to_park.put((request, client_address))
+        with contextlib.suppress(OSError):
+            self._wakeup_send.send(b"\0")
+
+    def _serve_connections(self) -> None:
+        while True:
+            item = self._connections.get()
+            if item is None:
+                return
+            request, client_address = item
+            parked = False
+            try:
+                parked = self.finish_request(request, client_address)
+            except Exception:
+                self.handle_error(request, client_address)
+            if parked and not self._closing:
+                self._park(request, client_address)
+            else:
+                self.shutdown_request(request)
+
+    def _watch_idle_connections(self) -> None:
+        # Only this thread touches the selector; other threads hand sockets over through _to_park.
+        while not self._closing:
+            for key, _ in self._selector.select(timeout=1.0):
+                if key.fileobj is self._wakeup_recv:
+                    with contextlib.suppress(OSError):
+                        self._wakeup_recv.recv(4096)
+                    continue
+                self._selector.unregister(key.fileobj)
+                self._connections.put(key.data[:2])
+            while True:
+                try:
+                    request, client_address = self._to_park.get_nowait()
+                except queue.Empty:
+                    break
+                self._selector.register(request, selectors.EVENT_READ, (request, client_address, time.monotonic()))
+            expired_before = time.monotonic() - BACKEND_KEEPALIVE_SECONDS
+            for key in list(self._selector.get_map().values()):
+                if key.data is not None and key.data[2] < expired_before:
+                    self._selector.unregister(key.fileobj)
+                    self.shutdown_request(key.fileobj)
+        for key in list(self._selector.get_map().values()):
+            if key.data is not None:
+                self.shutdown_request(key.fileobj)
+        self._selector.close()
+
+    def server_close(self) -> None:
+        super().server_close()
+        self._closing = True
+        with contextlib.suppress(OSError):
+            self._wakeup_send.send(b"\0")
+        self._watcher.join(timeout=2)
+        for _ in self._workers:
+            self._connections.put(None)
+
+
+def _warm_provider_connection() -> None:
+    # Pay the TCP+TLS handshake before the first analyze request instead of during it.
+    try:
+        _HTTP_POOL.warm(_active_provider_url())
+    except Exception as e:
+        logger.info("provider connection warm-up failed: %s", e)
+
+
+def _raise_keyboard_interrupt(signum, frame) -> None:
+    # Lets SIGTERM (docker stop) unwind serve_forever through the same cleanup as Ctrl-C.
+    raise KeyboardInterrupt
+
+
+def _fork_workers(count: int) -> list[int]:
+    """Fork count - 1 extra server processes; returns child pids in the parent and [] in a child."""
+    children = []
+    for _ in range(count - 1):
+        pid = os.fork()
+        if pid == 0:
+            return []
+        children.append(pid)
+    return children
 
 
 def main() -> None:
+    processes = BACKEND_PROCESSES if hasattr(os, "fork") and hasattr(socket, "SO_REUSEPORT") else 1
     print(f"mock-backend: starting on http://{HOST}:{PORT} (auth={'on' if REQUIRE_AUTH else 'off'})")
-    print(f"mock-backend: ai_provider={AI_PROVIDER}")
+    print(f"mock-backend: ai_provider={AI_PROVIDER} (workers={BACKEND_MAX_WORKERS}, processes={processes})")
     print(f"mock-backend: ai_mode={'visual-only' if AI_VISUAL_ONLY_MODE else ('ocr-only' if AI_OCR_ONLY_MODE else 'hybrid')}")
     if AI_PROVIDER == "qwen":
         print(f"mock-backend: primary_model={QWEN_PRIMARY_MODEL}")
@@ -800,13 +1864,30 @@ def main() -> None:
         print(f"mock-backend: fallback_model={OPENROUTER_FALLBACK_MODEL}")
         print(f"mock-backend: fallback_model_2={OPENROUTER_FALLBACK_MODEL_2}")
         print(f"mock-backend: fallback_model_3={OPENROUTER_FALLBACK_MODEL_3}")
-    server = ThreadingHTTPServer((HOST, PORT), Handler)
+    signal.signal(signal.SIGTERM, _raise_keyboard_interrupt)
+    # Fork before any thread starts, and flush so children do not repeat buffered startup output.
+    sys.stdout.flush()
+    children = _fork_workers(processes)
+    log_listener = _start_logging()
+    server = PooledHTTPServer((HOST, PORT), Handler, max_workers=BACKEND_MAX_WORKERS, reuse_port=processes > 1)
+    if _active_provider_api_key():
+        threading.Thread(target=_warm_provider_connection, name="mock-backend-warmup", daemon=True).start()
     try:
         server.serve_forever()
     except KeyboardInterrupt:
         pass
     finally:
+        signal.signal(signal.SIGTERM, signal.SIG_IGN)
         server.server_close()
+        _BATCH_EXECUTOR.shutdown(wait=False, cancel_futures=True)
+        _HTTP_POOL.close()
+        log_listener.stop()
+        for pid in children:
+            with contextlib.suppress(ProcessLookupError):
+                os.kill(pid, signal.SIGTERM)
+        for pid in children:
+            with contextlib.suppress(ChildProcessError):
+                os.waitpid(pid, 0)
 
 
 if __name__ == "__main__":
@@ -0,0 +1,97 @@
+"""Regression tests for mock_backend (run with: python -m unittest discover -s backend)."""
+
+import os
+import socket
+import threading
+import unittest
+
+os.environ["API_REQUIRE_AUTH"] = "false"
+os.environ.pop("OPENROUTER_API_KEY", None)
+os.environ.pop("QWEN_API_KEY", None)
+
+import mock_backend  # noqa: E402
+
+
+class KeepAliveFramingTest(unittest.TestCase):
+    """Bodies the server does not read must never be parsed as a follow-up request."""
+
+    @classmethod
+    def setUpClass(cls) -> None:
+        cls.server = mock_backend.PooledHTTPServer(("127.0.0.1", 0), mock_backend.Handler, max_workers=2)
+        cls.port = cls.server.server_address[1]
+        cls.thread = threading.Thread(target=cls.server.serve_forever, daemon=True)
+        cls.thread.start()
+
+    @classmethod
+    def tearDownClass(cls) -> None:
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def _exchange(self, raw: bytes) -> bytes:
+        # Read until the server closes the connection (or goes quiet), so every response it sent is seen.
+        with socket.create_connection(("127.0.0.1", self.port), timeout=2) as sock:
+            sock.sendall(raw)
+            received = b""
+            try:
+                while True:
+                    chunk = sock.recv(65536)
+                    if not chunk:
+                        break
+                    received += chunk
+            except socket.timeout:
+                pass
+        return received
+
+    def _post(self, headers: str, body: bytes) -> bytes:
+        return f"POST /v1/analyze-report HTTP/1.1\r\nHost: x\r\n{headers}\r\n".encode() + body
+
+    def test_negative_content_length_closes_connection(self) -> None:
+        smuggled = b"GET /health HTTP/1.1\r\nHost: x\r\n\r\n"
+        received = self._exchange(self._post("Content-Length: -1\r\n", smuggled))
+        self.assertEqual(received.count(b"HTTP/1.1 "), 1)
+        self.assertIn(b"HTTP/1.1 400 ", received)
+        self.assertIn(b"Connection: close", received)
+
+    def test_chunked_body_is_rejected_and_closes_connection(self) -> None:
+        body = b'13\r\n{"images": ["aGk="]}\r\n0\r\n\r\nGET /health HTTP/1.1\r\nHost: x\r\n\r\n'
+        received = self._exchange(self._post("Transfer-Encoding: chunked\r\n", body))
+        self.assertEqual(received.count(b"HTTP/1.1 "), 1)
+        self.assertIn(b"HTTP/1.1 411 ", received)
+        self.assertIn(b"Connection: close", received)
+
+    def test_duplicate_content_length_closes_connection(self) -> None:
+        received = self._exchange(self._post("Content-Length: 2\r\nContent-Length: 40\r\n", b"{}"))
+        self.assertEqual(received.count(b"HTTP/1.1 "), 1)
+        self.assertIn(b"Connection: close", received)
+
+    def test_get_with_body_closes_connection(self) -> None:
+        smuggled = b"GET /health HTTP/1.1\r\nHost: x\r\n\r\n"
+        raw = b"GET /health HTTP/1.1\r\nHost: x\r\nContent-Length: %d\r\n\r\n" % len(smuggled) + smuggled
+        received = self._exchange(raw)
+        self.assertEqual(received.count(b"HTTP/1.1 "), 1)
+        self.assertIn(b"Connection: close", received)
+
+    def test_expect_100_continue_is_sent_before_the_body(self) -> None:
+        with socket.create_connection(("127.0.0.1", self.port), timeout=2) as sock:
+            sock.sendall(self._post("Expect: 100-continue\r\nContent-Length: 14\r\n", b""))
+            self.assertTrue(sock.recv(65536).startswith(b"HTTP/1.1 100 Continue\r\n"))
+            sock.sendall(b'{"images": []}')
+            self.assertIn(b"HTTP/1.1 400 ", sock.recv(65536))
+
+    def test_expect_100_continue_rejects_oversized_body_up_front(self) -> None:
+        length = mock_backend.BACKEND_MAX_BODY_BYTES + 1
+        received = self._exchange(self._post(f"Expect: 100-continue\r\nContent-Length: {length}\r\n", b""))
+        self.assertNotIn(b"100 Continue", received)
+        self.assertIn(b"HTTP/1.1 413 ", received)
+        self.assertIn(b"Connection: close", received)
+
+    def test_fully_read_body_keeps_connection_alive(self) -> None:
+        body = b'{"images": []}'
+        raw = self._post(f"Content-Length: {len(body)}\r\n", body) + b"GET /health HTTP/1.1\r\nHost: x\r\n\r\n"
+        received = self._exchange(raw)
+        self.assertIn(b"HTTP/1.1 400 ", received)
+        self.assertIn(b"HTTP/1.1 200 ", received)
+
+
+if __name__ == "__main__":
+    unittest.main()